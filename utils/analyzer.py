@@ -1,38 +1,117 @@
+import threading
+from collections import deque
+from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor
 import cv2
 import numpy as np
 from deepface import DeepFace
-from .color_utils import hsv_stats, blur_laplacian
+from .color_utils import hsv_stats, blur_laplacian, gray_histogram, histogram_stats
+from .rules import (RULES, RULE_PENALTIES, STRESS_EMOTIONS,
+                    feature_vector, match_rules, rules_using)
 
-def analyze_skin_regions(frame):
-    """Extract detailed skin analysis from different facial regions."""
+# Colour/texture rules only use means and coarse statistics, so they run
+# on a copy shrunk to fit inside this (width, height) box
+ANALYSIS_MAX_SIZE = (320, 240)
+
+# Features that are expensive to measure and only computed on demand
+_EYE_FEATURES = ('dark_circles', 'redness', 'puffiness')
+_LAZY_FEATURES = _EYE_FEATURES + ('asymmetry',)
+# detect_eye_features never reports puffiness, so the rules that need it
+# (hypothyroidism, kidney disease) cannot fire and must not trigger the
+# cascade; with puffiness unmeasured (NaN) they fail as before
+_EYE_RULES = rules_using('dark_circles', 'redness')
+_SYMMETRY_RULES = rules_using('asymmetry')
+
+# Frames of an analyze_frames batch that may wait on DeepFace at once
+BATCH_MAX_IN_FLIGHT = 4
+
+# Attribute models behind the DeepFace actions used here
+_DEEPFACE_MODELS = ('Emotion', 'Age', 'Race')
+_deepface_warm_lock = threading.Lock()
+
+# Shared workers for the independent per-frame analyses; the OpenCV calls
+# they make release the GIL, so these run truly in parallel
+_POOL = ThreadPoolExecutor(max_workers=4)
+
+class _InlineExecutor:
+    """Executor stand-in that runs each task immediately on the calling thread."""
+    def submit(self, func, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(func(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+_INLINE = _InlineExecutor()
+
+_EYE_CASCADE_PATH = cv2.data.haarcascades + 'haarcascade_eye.xml'
+_cascade_local = threading.local()
+
+def _eye_cascade():
+    """Return this thread's eye cascade, loading the XML only once per thread."""
+    cascade = getattr(_cascade_local, 'eye', None)
+    if cascade is None:
+        cascade = cv2.CascadeClassifier(_EYE_CASCADE_PATH)
+        _cascade_local.eye = cascade
+    return cascade
+
+def _buffer(buffers, name, shape):
+    """Reusable uint8 output array for batch callers; None for single frames."""
+    if buffers is None:
+        return None
+    buf = buffers.get(name)
+    if buf is None or buf.shape != shape:
+        buf = buffers[name] = np.empty(shape, dtype=np.uint8)
+    return buf
+
+def _shrink(frame, scale, buffers=None):
+    """Resize frame by scale when it is a reduction; never upsamples."""
+    if scale >= 1:
+        return frame
     height, width = frame.shape[:2]
-    
-    # Define facial regions
-    regions = {
-        'forehead': frame[int(height*0.1):int(height*0.3), int(width*0.3):int(width*0.7)],
-        'cheeks': frame[int(height*0.3):int(height*0.6), :],
-        'chin': frame[int(height*0.6):int(height*0.9), int(width*0.3):int(width*0.7)],
-        'under_eyes': frame[int(height*0.25):int(height*0.4), int(width*0.2):int(width*0.8)]
+    size = (max(1, int(width * scale)), max(1, int(height * scale)))
+    dst = _buffer(buffers, 'small', (size[1], size[0]) + frame.shape[2:])
+    return cv2.resize(frame, size, dst=dst, interpolation=cv2.INTER_AREA)
+
+def _downscale(frame, buffers=None):
+    """Shrink frame to fit ANALYSIS_MAX_SIZE, keeping its aspect ratio."""
+    height, width = frame.shape[:2]
+    return _shrink(frame, min(ANALYSIS_MAX_SIZE[0] / width, ANALYSIS_MAX_SIZE[1] / height), buffers)
+
+@lru_cache(maxsize=4)
+def _region_slices(height, width):
+    """Facial region (row, column) slices for a frame size, cached across frames."""
+    return {
+        'forehead': (slice(int(height*0.1), int(height*0.3)), slice(int(width*0.3), int(width*0.7))),
+        'cheeks': (slice(int(height*0.3), int(height*0.6)), slice(None)),
+        'chin': (slice(int(height*0.6), int(height*0.9)), slice(int(width*0.3), int(width*0.7))),
+        'under_eyes': (slice(int(height*0.25), int(height*0.4)), slice(int(width*0.2), int(width*0.8)))
     }
+
+def analyze_skin_regions(frame, hsv):
+    """Extract detailed skin analysis from different facial regions."""
+    height, width = frame.shape[:2]
     
     region_data = {}
-    for name, roi in regions.items():
+    for name, (rows, cols) in _region_slices(height, width).items():
+        # Slice the precomputed HSV frame
+        roi = hsv[rows, cols]
         if roi.size > 0:
-            hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
+            # Per-channel mean and std in a single pass over the ROI
+            mean, std = cv2.meanStdDev(roi)
             region_data[name] = {
-                'mean_h': np.mean(hsv[:,:,0]),
-                'mean_s': np.mean(hsv[:,:,1]),
-                'mean_v': np.mean(hsv[:,:,2]),
-                'std_v': np.std(hsv[:,:,2])
+                'mean_h': float(mean[0, 0]),
+                'mean_s': float(mean[1, 0]),
+                'mean_v': float(mean[2, 0]),
+                'std_v': float(std[2, 0])
             }
     
     return region_data
 
-def detect_eye_features(frame):
+def detect_eye_features(frame, gray):
     """Analyze eye region for dark circles and puffiness."""
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    eye_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_eye.xml')
-    eyes = eye_cascade.detectMultiScale(gray, 1.3, 5)
+    eyes = _eye_cascade().detectMultiScale(gray, 1.3, 5)
     
     eye_data = {'dark_circles': False, 'puffiness': False, 'redness': False}
     
@@ -40,64 +119,75 @@ def detect_eye_features(frame):
         # Extract under-eye region
         under_eye = frame[ey+eh:ey+eh+20, ex:ex+ew]
         if under_eye.size > 0:
-            under_eye_gray = cv2.cvtColor(under_eye, cv2.COLOR_BGR2GRAY)
-            avg_brightness = np.mean(under_eye_gray)
+            under_eye_gray = gray[ey+eh:ey+eh+20, ex:ex+ew]
+            avg_brightness = cv2.mean(under_eye_gray)[0]
             
             # Dark circles detection
             if avg_brightness < 80:
                 eye_data['dark_circles'] = True
             
-            # Check for redness
-            b, g, r = cv2.split(under_eye)
-            if np.mean(r) > np.mean(g) + 20:
+            # Check for redness (per-channel means in one pass, no split)
+            b_mean, g_mean, r_mean, _ = cv2.mean(under_eye)
+            if r_mean > g_mean + 20:
                 eye_data['redness'] = True
     
     return eye_data
 
-def analyze_skin_texture(frame):
-    """Analyze skin texture for acne, dryness, and oiliness."""
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+def analyze_skin_texture(full_gray, gray_hist):
+    """Analyze skin texture for acne and dryness."""
+    # Texture variance (high = rough/acne, low = smooth), from the gray histogram
+    texture_var = float(histogram_stats(gray_hist)['var'])
     
-    # Texture variance (high = rough/acne, low = smooth)
-    texture_var = np.var(gray)
-    
-    # Edge detection for spots/blemishes
-    edges = cv2.Canny(gray, 50, 150)
-    edge_density = np.sum(edges) / edges.size
-    
-    # Shiny/oily detection using brightness variance
-    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-    brightness_std = np.std(hsv[:,:,2])
+    # Edge detection for spots/blemishes; the edge fraction depends on
+    # resolution, so it is measured on the full frame
+    edges = cv2.Canny(full_gray, 50, 150)
+    edge_density = cv2.countNonZero(edges) / edges.size
     
     return {
         'texture_variance': texture_var,
-        'edge_density': edge_density,
-        'brightness_std': brightness_std
+        'edge_density': edge_density
     }
 
-def detect_facial_symmetry(frame):
+def detect_facial_symmetry(gray):
     """Check for facial asymmetry which may indicate certain conditions."""
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
     height, width = gray.shape
+    half = width // 2
+    if half == 0:
+        # No halves to compare; NaN fails every rule bound
+        return float('nan')
     
-    left_half = gray[:, :width//2]
-    right_half = cv2.flip(gray[:, width//2:], 1)
+    # Mirror the right half by reading its columns backwards
+    left_half = gray[:, :half]
+    right_half = np.ascontiguousarray(gray[:, :width-half-1:-1])
     
-    # Resize to match if needed
-    min_width = min(left_half.shape[1], right_half.shape[1])
-    left_half = left_half[:, :min_width]
-    right_half = right_half[:, :min_width]
-    
-    # Calculate difference
-    diff = cv2.absdiff(left_half, right_half)
-    asymmetry_score = np.mean(diff)
+    # Mean absolute difference in one fused |L-R| reduction
+    asymmetry_score = cv2.norm(left_half, right_half, cv2.NORM_L1) / left_half.size
     
     return asymmetry_score
 
-def analyze_frame(frame, face_detection=None):
+def _warm_deepface():
+    """Build DeepFace's attribute models once; its model cache is not thread-safe."""
+    with _deepface_warm_lock:
+        for name in _DEEPFACE_MODELS:
+            DeepFace.build_model(name)
+
+def _submit_deepface(frame, executor=_POOL):
+    """Start DeepFace on the full frame; returns its future."""
+    # Face crops are resized to the model input inside DeepFace, so the
+    # detector needs the original resolution to keep crops large
+    return executor.submit(
+        DeepFace.analyze,
+        frame,
+        actions=['emotion', 'age', 'race'],
+        enforce_detection=False,
+        detector_backend='opencv'
+    )
+
+def _analyze(frame, deepface_future, executor, buffers=None):
     """
-    Comprehensive facial health analysis with 20+ detectable conditions.
-    Returns emotion, race, age, and predicted diseases with confidence levels.
+    Run the OpenCV statistics and disease rules for one frame, using
+    executor for the independent steps. buffers (a dict) lets batch
+    callers reuse the per-frame working arrays across same-sized frames.
     """
     
     data = {
@@ -109,14 +199,33 @@ def analyze_frame(frame, face_detection=None):
         "recommendations": []
     }
     
+    # --- Advanced Analysis ---
+    # The statistics below run on a downscaled copy, converted once and
+    # shared with every helper
+    small = _downscale(frame, buffers)
+    hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV, dst=_buffer(buffers, 'hsv', small.shape))
+    gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=_buffer(buffers, 'gray', small.shape[:2]))
+    
+    # Laplacian variance and Canny edge density depend on resolution, so blur
+    # and edges are measured on the full frame. The full-resolution gray is
+    # shared with the eye cascade below.
+    full_gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=_buffer(buffers, 'full_gray', frame.shape[:2]))
+    blur_future = executor.submit(blur_laplacian, full_gray)
+    region_future = executor.submit(analyze_skin_regions, small, hsv)
+    
+    # One histogram pass serves every gray-level threshold and moment
+    gray_hist = gray_histogram(gray)
+    texture_future = executor.submit(analyze_skin_texture, full_gray, gray_hist)
+    
+    # Channel means plus V std (shiny/oily skin) in a single pass
+    hsv_means = hsv_stats(hsv)
+    blur_val = blur_future.result()
+    region_data = region_future.result()
+    texture_data = texture_future.result()
+    
     try:
         # DeepFace analysis
-        results = DeepFace.analyze(
-            frame,
-            actions=['emotion', 'age', 'race'],
-            enforce_detection=False,
-            detector_backend='opencv'
-        )
+        results = deepface_future.result()
         
         data["emotion"] = results[0].get("dominant_emotion", "Unknown")
         data["race"] = results[0].get("dominant_race", "Unknown")
@@ -125,276 +234,60 @@ def analyze_frame(frame, face_detection=None):
     except Exception as e:
         print("DeepFace error:", e)
     
-    # --- Advanced Analysis ---
-    hsv_means = hsv_stats(frame)
-    blur_val = blur_laplacian(frame)
-    region_data = analyze_skin_regions(frame)
-    eye_data = detect_eye_features(frame)
-    texture_data = analyze_skin_texture(frame)
-    asymmetry = detect_facial_symmetry(frame)
-    
     avg_hue = hsv_means['h']
     avg_sat = hsv_means['s']
     avg_val = hsv_means['v']
     
-    diseases = []
-    health_score = 100
+    # Vitiligo: fraction of very bright (depigmented) pixels
+    white_pixel_ratio = float(gray_hist[201:].sum() / gray.size)
+    
+    features = {
+        'hue': avg_hue,
+        'sat': avg_sat,
+        'val': avg_val,
+        'blur': blur_val,
+        'texture_var': texture_data['texture_variance'],
+        'edge_density': texture_data['edge_density'],
+        'brightness_std': hsv_means['v_std'],
+        'white_ratio': white_pixel_ratio,
+        'stressed': float(data["emotion"] in STRESS_EMOTIONS)
+    }
+    if 'forehead' in region_data:
+        features['forehead_v_delta'] = region_data['forehead']['mean_v'] - avg_val
+    if 'cheeks' in region_data:
+        features['cheeks_h'] = region_data['cheeks']['mean_h']
+        features['cheeks_v'] = region_data['cheeks']['mean_v']
+    if 'chin' in region_data:
+        features['chin_h'] = region_data['chin']['mean_h']
     
     # --- COMPREHENSIVE DISEASE DETECTION ---
+    # Eye cascade and symmetry are only needed by a few rules, so they run
+    # only when one of those rules can still fire on the cheap features.
+    # The cascade and the 20px under-eye strip need full resolution.
+    hits = match_rules(feature_vector(features), skip=_LAZY_FEATURES)
+    eye_future = symmetry_future = None
+    if (hits & _EYE_RULES).any():
+        eye_future = executor.submit(detect_eye_features, frame, full_gray)
+    if (hits & _SYMMETRY_RULES).any():
+        symmetry_future = executor.submit(detect_facial_symmetry, gray)
+    if eye_future is not None:
+        eye_data = eye_future.result()
+        for name in _EYE_FEATURES:
+            features[name] = float(eye_data[name])
+    if symmetry_future is not None:
+        features['asymmetry'] = symmetry_future.result()
+    hits = match_rules(feature_vector(features))
     
-    # 1. Jaundice (Liver problems)
-    if 20 < avg_hue < 40 and avg_sat > 80:
-        diseases.append({
-            "name": "Jaundice (Liver Issue)",
-            "confidence": "High",
-            "description": "Yellowish skin tone detected"
-        })
-        health_score -= 30
-        data["recommendations"].append("Consult a hepatologist immediately")
-    
-    # 2. Anemia (Iron deficiency)
-    if avg_sat < 40 and avg_val > 150:
-        diseases.append({
-            "name": "Anemia",
-            "confidence": "Medium",
-            "description": "Pale complexion indicates possible iron deficiency"
-        })
-        health_score -= 20
-        data["recommendations"].append("Check hemoglobin levels; increase iron intake")
-    
-    # 3. Cyanosis (Oxygen deficiency)
-    if 90 < avg_hue < 130 and avg_sat > 60:
-        diseases.append({
-            "name": "Cyanosis",
-            "confidence": "High",
-            "description": "Bluish tint suggests low blood oxygen"
-        })
-        health_score -= 35
-        data["recommendations"].append("Seek immediate medical attention - possible respiratory/cardiac issue")
-    
-    # 4. Rosacea / Inflammation
-    if avg_hue < 15 and avg_sat > 100:
-        diseases.append({
-            "name": "Rosacea / Skin Inflammation",
-            "confidence": "Medium",
-            "description": "Persistent facial redness detected"
-        })
-        health_score -= 15
-        data["recommendations"].append("Avoid triggers like alcohol, spicy foods; consult dermatologist")
-    
-    # 5. Vitiligo (Depigmentation) - IMPROVED
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    _, bright_mask = cv2.threshold(gray, 200, 255, cv2.THRESH_BINARY)
-    white_pixel_ratio = np.sum(bright_mask == 255) / bright_mask.size
-    
-    if white_pixel_ratio > 0.15 and texture_data['brightness_std'] > 35 and avg_sat < 60:
-        diseases.append({
-            "name": "Vitiligo",
-            "confidence": "Medium",
-            "description": "White/depigmented patches detected on skin"
-        })
-        health_score -= 10
-        data["recommendations"].append("Consult dermatologist for vitiligo treatment options")
-    
-    # 6. Acne / Skin Infection (Lowered threshold)
-    if texture_data['edge_density'] > 0.12 and texture_data['texture_variance'] > 600:
-        diseases.append({
-            "name": "Acne / Skin Lesions",
-            "confidence": "Medium",
-            "description": "Multiple blemishes or spots detected"
-        })
-        health_score -= 12
-        data["recommendations"].append("Maintain skincare routine; consider topical treatments")
-    
-    # 7. Eczema / Dermatitis (More sensitive)
-    if texture_data['texture_variance'] > 800 and avg_sat < 60:
-        diseases.append({
-            "name": "Eczema / Dermatitis",
-            "confidence": "Low",
-            "description": "Dry, rough skin texture"
-        })
-        health_score -= 15
-        data["recommendations"].append("Use moisturizers; avoid irritants; see dermatologist")
-    
-    # 8. Melasma / Hyperpigmentation
-    if 'forehead' in region_data and region_data['forehead']['mean_v'] < avg_val - 20:
-        diseases.append({
-            "name": "Melasma / Hyperpigmentation",
-            "confidence": "Low",
-            "description": "Dark patches on forehead region"
-        })
-        health_score -= 8
-        data["recommendations"].append("Use sunscreen; consider skin-lightening treatments")
-    
-    # 9. Dehydration
-    if avg_val < 100 and blur_val < 60:
-        diseases.append({
-            "name": "Dehydration",
-            "confidence": "Medium",
-            "description": "Dull, tired-looking skin"
-        })
-        health_score -= 10
-        data["recommendations"].append("Increase water intake to 8+ glasses daily")
-    
-    # 10. Chronic Fatigue / Sleep Deprivation
-    if eye_data['dark_circles'] and avg_val < 110:
-        diseases.append({
-            "name": "Sleep Deprivation / Chronic Fatigue",
-            "confidence": "Medium",
-            "description": "Dark circles and dull complexion"
-        })
-        health_score -= 15
-        data["recommendations"].append("Improve sleep quality; aim for 7-9 hours nightly")
-    
-    # 11. Allergic Reaction
-    if eye_data['redness'] and avg_hue < 20:
-        diseases.append({
-            "name": "Allergic Reaction",
-            "confidence": "Medium",
-            "description": "Redness and possible swelling detected"
-        })
-        health_score -= 18
-        data["recommendations"].append("Identify and avoid allergens; antihistamines may help")
-    
-    # 12. Thyroid Disorder (Hypothyroidism)
-    if avg_sat < 35 and avg_val > 160 and eye_data.get('puffiness', False):
-        diseases.append({
-            "name": "Hypothyroidism (Possible)",
-            "confidence": "Low",
-            "description": "Pale, puffy face may indicate thyroid issues"
-        })
-        health_score -= 20
-        data["recommendations"].append("Get thyroid function tests (TSH, T3, T4)")
-    
-    # 13. Lupus (Butterfly rash indicator)
-    if 'cheeks' in region_data and region_data['cheeks']['mean_h'] < 15 and asymmetry < 10:
-        diseases.append({
-            "name": "Lupus (Butterfly Rash Indicator)",
-            "confidence": "Very Low",
-            "description": "Symmetrical redness across cheeks"
-        })
-        health_score -= 25
-        data["recommendations"].append("Consult rheumatologist for autoimmune screening")
-    
-    # 14. Cushing's Syndrome
-    if avg_val > 170 and 'cheeks' in region_data and region_data['cheeks']['mean_v'] > 180:
-        diseases.append({
-            "name": "Cushing's Syndrome (Moon Face)",
-            "confidence": "Very Low",
-            "description": "Round, full facial appearance"
-        })
-        health_score -= 22
-        data["recommendations"].append("Consult endocrinologist for cortisol level testing")
-    
-    # 15. Seborrheic Dermatitis
-    if texture_data['edge_density'] > 0.12 and 20 < avg_hue < 35:
-        diseases.append({
-            "name": "Seborrheic Dermatitis",
-            "confidence": "Low",
-            "description": "Flaky, oily patches on skin"
-        })
-        health_score -= 12
-        data["recommendations"].append("Use antifungal shampoos; maintain scalp hygiene")
-    
-    # 16. Psoriasis
-    if texture_data['texture_variance'] > 1200 and avg_hue > 15 and avg_hue < 25:
-        diseases.append({
-            "name": "Psoriasis",
-            "confidence": "Low",
-            "description": "Rough, scaly skin patches"
-        })
-        health_score -= 18
-        data["recommendations"].append("Consult dermatologist for biologics or topical treatments")
-    
-    # 17. Liver Disease (Advanced)
-    if 25 < avg_hue < 35 and avg_sat > 90 and avg_val < 120:
-        diseases.append({
-            "name": "Advanced Liver Disease",
-            "confidence": "Medium",
-            "description": "Dark yellowish tone with dullness"
-        })
-        health_score -= 40
-        data["recommendations"].append("URGENT: See hepatologist for liver function tests")
-    
-    # 18. Kidney Disease
-    if avg_val > 180 and avg_sat < 30 and eye_data.get('puffiness', False):
-        diseases.append({
-            "name": "Kidney Disease (Possible)",
-            "confidence": "Low",
-            "description": "Pale, puffy face with fluid retention"
-        })
-        health_score -= 25
-        data["recommendations"].append("Get kidney function tests (creatinine, BUN)")
-    
-    # 19. Malnutrition
-    if avg_sat < 25 and avg_val < 90 and blur_val < 50:
-        diseases.append({
-            "name": "Malnutrition",
-            "confidence": "Medium",
-            "description": "Very pale and dull complexion"
-        })
-        health_score -= 30
-        data["recommendations"].append("Improve diet; consider nutritional supplements")
-    
-    # 20. Hormonal Imbalance (Acne pattern)
-    if texture_data['edge_density'] > 0.18 and 'chin' in region_data:
-        diseases.append({
-            "name": "Hormonal Acne",
-            "confidence": "Medium",
-            "description": "Breakouts concentrated in lower face"
-        })
-        health_score -= 15
-        data["recommendations"].append("Consult endocrinologist; may need hormonal treatment")
-    
-    # 21. Stress / Anxiety
-    if data["emotion"] in ["angry", "fear", "sad"] and avg_val < 105:
-        diseases.append({
-            "name": "Chronic Stress / Anxiety",
-            "confidence": "Medium",
-            "description": "Emotional distress visible in facial features"
-        })
-        health_score -= 18
-        data["recommendations"].append("Practice stress management; consider counseling")
-    
-    # 22. Vitamin D Deficiency
-    if avg_val > 165 and avg_sat < 35:
-        diseases.append({
-            "name": "Vitamin D Deficiency",
-            "confidence": "Low",
-            "description": "Very pale skin lacking healthy glow"
-        })
-        health_score -= 12
-        data["recommendations"].append("Get sun exposure; vitamin D supplements")
-    
-    # 23. Perioral Dermatitis
-    if 'chin' in region_data and region_data['chin']['mean_h'] < 20 and texture_data['edge_density'] > 0.14:
-        diseases.append({
-            "name": "Perioral Dermatitis",
-            "confidence": "Low",
-            "description": "Rash around mouth area"
-        })
-        health_score -= 10
-        data["recommendations"].append("Avoid steroid creams; see dermatologist")
-    
-    # 24. Contact Dermatitis
-    if asymmetry > 25 and avg_hue < 15:
-        diseases.append({
-            "name": "Contact Dermatitis",
-            "confidence": "Low",
-            "description": "Localized redness from irritant/allergen"
-        })
-        health_score -= 10
-        data["recommendations"].append("Identify irritant; use hypoallergenic products")
-    
-    # 25. Sun Damage / Photoaging
-    if texture_data['texture_variance'] > 900 and avg_hue > 15 and avg_hue < 25:
+    diseases = []
+    for i in np.flatnonzero(hits):
+        rule = RULES[i]
         diseases.append({
-            "name": "Sun Damage / Photoaging",
-            "confidence": "Medium",
-            "description": "Uneven texture and pigmentation from UV exposure"
+            "name": rule["name"],
+            "confidence": rule["confidence"],
+            "description": rule["description"]
         })
-        health_score -= 15
-        data["recommendations"].append("Daily SPF 50+; consider retinoids")
+        data["recommendations"].append(rule["recommendation"])
+    health_score = 100 - int(RULE_PENALTIES[hits].sum())
     
     # --- FINAL ASSESSMENT ---
     if not diseases:
@@ -408,4 +301,37 @@ def analyze_frame(frame, face_detection=None):
     data["diseases"] = diseases
     data["health_score"] = max(0, health_score)
     
-    return data
\ No newline at end of file
+    return data
+
+def analyze_frame(frame, face_detection=None):
+    """
+    Comprehensive facial health analysis with 20+ detectable conditions.
+    Returns emotion, race, age, and predicted diseases with confidence levels.
+    """
+    # DeepFace dominates latency, so start it first and overlap it with the
+    # OpenCV analysis, which fans out over the same pool
+    return _analyze(frame, _submit_deepface(frame), _POOL)
+
+def analyze_frames(frames):
+    """
+    Batch version of analyze_frame for webcam/video sequences.
+    Returns one result dict per frame, in order.
+    """
+    # DeepFace runs serially on a dedicated worker, at most
+    # BATCH_MAX_IN_FLIGHT frames ahead, while the OpenCV work runs on this
+    # thread with one set of working arrays per frame size. The shared pool
+    # serving analyze_frame is left alone.
+    results = []
+    buffers = {}
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=1) as deepface_worker:
+        deepface_worker.submit(_warm_deepface)
+        for frame in frames:
+            pending.append((frame, _submit_deepface(frame, deepface_worker)))
+            if len(pending) >= BATCH_MAX_IN_FLIGHT:
+                frame, future = pending.popleft()
+                results.append(_analyze(frame, future, _INLINE, buffers))
+        while pending:
+            frame, future = pending.popleft()
+            results.append(_analyze(frame, future, _INLINE, buffers))
+    return results
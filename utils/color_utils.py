@@ -1,16 +1,27 @@
 import cv2
 import numpy as np
 
-def hsv_stats(image):
-    """Returns mean HSV values of the given image."""
-    hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-    h_mean = np.mean(hsv[:, :, 0])
-    s_mean = np.mean(hsv[:, :, 1])
-    v_mean = np.mean(hsv[:, :, 2])
-    return {'h': h_mean, 's': s_mean, 'v': v_mean}
+def hsv_stats(hsv):
+    """Returns mean HSV values and V (brightness) std of an image already converted to HSV."""
+    mean, std = cv2.meanStdDev(hsv)
+    return {'h': float(mean[0, 0]), 's': float(mean[1, 0]), 'v': float(mean[2, 0]),
+            'v_std': float(std[2, 0])}
 
-def blur_laplacian(image):
-    """Returns a measure of blurriness using Laplacian variance."""
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    val = cv2.Laplacian(gray, cv2.CV_64F).var()
+def blur_laplacian(gray):
+    """Returns a measure of blurriness using Laplacian variance of a grayscale image."""
+    # 3x3 Laplacian of uint8 fits in int16; avoids a float64 image
+    _, std = cv2.meanStdDev(cv2.Laplacian(gray, cv2.CV_16S))
+    val = float(std[0, 0]) ** 2
     return val
+
+def gray_histogram(gray):
+    """Returns the 256-bin intensity histogram of a grayscale image."""
+    return cv2.calcHist([gray], [0], None, [256], [0, 256]).ravel()
+
+def histogram_stats(hist):
+    """Returns the variance of the pixel values counted in a 256-bin histogram."""
+    bins = np.arange(256)
+    total = hist.sum()
+    mean = (hist * bins).sum() / total
+    var = (hist * (bins - mean) ** 2).sum() / total
+    return {'var': var}
@@ -11,7 +11,7 @@ def check_quality(frame, bbox, cfg, blur_score):
     if blur_score < cfg["preprocess"]["blur_min_laplacian"]:
         return False, "Too blurry"
     # overall lighting
-    L_mean = cv2.cvtColor(frame, cv2.COLOR_BGR2LAB)[:,:,0].mean()
+    L_mean = cv2.mean(cv2.cvtColor(frame, cv2.COLOR_BGR2LAB))[0]
     if L_mean < cfg["preprocess"]["min_light_L_mean"]:
         return False, "Too dark"
     return True, "OK"
@@ -0,0 +1,284 @@
+import numpy as np
+
+# Scalar features the disease rules are evaluated on, in vector order.
+# Boolean features are encoded as 0.0 / 1.0; features that cannot be
+# measured (e.g. a region outside the frame) are NaN and fail any bound.
+FEATURES = (
+    'hue', 'sat', 'val', 'blur',
+    'texture_var', 'edge_density', 'brightness_std', 'white_ratio',
+    'asymmetry', 'forehead_v_delta', 'cheeks_h', 'cheeks_v', 'chin_h',
+    'dark_circles', 'redness', 'puffiness', 'stressed'
+)
+FEATURE_INDEX = {name: i for i, name in enumerate(FEATURES)}
+
+STRESS_EMOTIONS = ("angry", "fear", "sad")
+
+# Bound for boolean features: true when the flag is set
+FLAG = (0.5, None)
+
+# Each rule fires when every feature in "bounds" lies strictly inside its
+# (low, high) interval; None means unbounded on that side.
+RULES = [
+    # 1. Jaundice (Liver problems)
+    {
+        "name": "Jaundice (Liver Issue)",
+        "confidence": "High",
+        "description": "Yellowish skin tone detected",
+        "penalty": 30,
+        "recommendation": "Consult a hepatologist immediately",
+        "bounds": {'hue': (20, 40), 'sat': (80, None)}
+    },
+    # 2. Anemia (Iron deficiency)
+    {
+        "name": "Anemia",
+        "confidence": "Medium",
+        "description": "Pale complexion indicates possible iron deficiency",
+        "penalty": 20,
+        "recommendation": "Check hemoglobin levels; increase iron intake",
+        "bounds": {'sat': (None, 40), 'val': (150, None)}
+    },
+    # 3. Cyanosis (Oxygen deficiency)
+    {
+        "name": "Cyanosis",
+        "confidence": "High",
+        "description": "Bluish tint suggests low blood oxygen",
+        "penalty": 35,
+        "recommendation": "Seek immediate medical attention - possible respiratory/cardiac issue",
+        "bounds": {'hue': (90, 130), 'sat': (60, None)}
+    },
+    # 4. Rosacea / Inflammation
+    {
+        "name": "Rosacea / Skin Inflammation",
+        "confidence": "Medium",
+        "description": "Persistent facial redness detected",
+        "penalty": 15,
+        "recommendation": "Avoid triggers like alcohol, spicy foods; consult dermatologist",
+        "bounds": {'hue': (None, 15), 'sat': (100, None)}
+    },
+    # 5. Vitiligo (Depigmentation)
+    {
+        "name": "Vitiligo",
+        "confidence": "Medium",
+        "description": "White/depigmented patches detected on skin",
+        "penalty": 10,
+        "recommendation": "Consult dermatologist for vitiligo treatment options",
+        "bounds": {'white_ratio': (0.15, None), 'brightness_std': (35, None), 'sat': (None, 60)}
+    },
+    # 6. Acne / Skin Infection (Lowered threshold)
+    {
+        "name": "Acne / Skin Lesions",
+        "confidence": "Medium",
+        "description": "Multiple blemishes or spots detected",
+        "penalty": 12,
+        "recommendation": "Maintain skincare routine; consider topical treatments",
+        "bounds": {'edge_density': (0.12, None), 'texture_var': (600, None)}
+    },
+    # 7. Eczema / Dermatitis (More sensitive)
+    {
+        "name": "Eczema / Dermatitis",
+        "confidence": "Low",
+        "description": "Dry, rough skin texture",
+        "penalty": 15,
+        "recommendation": "Use moisturizers; avoid irritants; see dermatologist",
+        "bounds": {'texture_var': (800, None), 'sat': (None, 60)}
+    },
+    # 8. Melasma / Hyperpigmentation
+    {
+        "name": "Melasma / Hyperpigmentation",
+        "confidence": "Low",
+        "description": "Dark patches on forehead region",
+        "penalty": 8,
+        "recommendation": "Use sunscreen; consider skin-lightening treatments",
+        "bounds": {'forehead_v_delta': (None, -20)}
+    },
+    # 9. Dehydration
+    {
+        "name": "Dehydration",
+        "confidence": "Medium",
+        "description": "Dull, tired-looking skin",
+        "penalty": 10,
+        "recommendation": "Increase water intake to 8+ glasses daily",
+        "bounds": {'val': (None, 100), 'blur': (None, 60)}
+    },
+    # 10. Chronic Fatigue / Sleep Deprivation
+    {
+        "name": "Sleep Deprivation / Chronic Fatigue",
+        "confidence": "Medium",
+        "description": "Dark circles and dull complexion",
+        "penalty": 15,
+        "recommendation": "Improve sleep quality; aim for 7-9 hours nightly",
+        "bounds": {'dark_circles': FLAG, 'val': (None, 110)}
+    },
+    # 11. Allergic Reaction
+    {
+        "name": "Allergic Reaction",
+        "confidence": "Medium",
+        "description": "Redness and possible swelling detected",
+        "penalty": 18,
+        "recommendation": "Identify and avoid allergens; antihistamines may help",
+        "bounds": {'redness': FLAG, 'hue': (None, 20)}
+    },
+    # 12. Thyroid Disorder (Hypothyroidism)
+    {
+        "name": "Hypothyroidism (Possible)",
+        "confidence": "Low",
+        "description": "Pale, puffy face may indicate thyroid issues",
+        "penalty": 20,
+        "recommendation": "Get thyroid function tests (TSH, T3, T4)",
+        "bounds": {'sat': (None, 35), 'val': (160, None), 'puffiness': FLAG}
+    },
+    # 13. Lupus (Butterfly rash indicator)
+    {
+        "name": "Lupus (Butterfly Rash Indicator)",
+        "confidence": "Very Low",
+        "description": "Symmetrical redness across cheeks",
+        "penalty": 25,
+        "recommendation": "Consult rheumatologist for autoimmune screening",
+        "bounds": {'cheeks_h': (None, 15), 'asymmetry': (None, 10)}
+    },
+    # 14. Cushing's Syndrome
+    {
+        "name": "Cushing's Syndrome (Moon Face)",
+        "confidence": "Very Low",
+        "description": "Round, full facial appearance",
+        "penalty": 22,
+        "recommendation": "Consult endocrinologist for cortisol level testing",
+        "bounds": {'val': (170, None), 'cheeks_v': (180, None)}
+    },
+    # 15. Seborrheic Dermatitis
+    {
+        "name": "Seborrheic Dermatitis",
+        "confidence": "Low",
+        "description": "Flaky, oily patches on skin",
+        "penalty": 12,
+        "recommendation": "Use antifungal shampoos; maintain scalp hygiene",
+        "bounds": {'edge_density': (0.12, None), 'hue': (20, 35)}
+    },
+    # 16. Psoriasis
+    {
+        "name": "Psoriasis",
+        "confidence": "Low",
+        "description": "Rough, scaly skin patches",
+        "penalty": 18,
+        "recommendation": "Consult dermatologist for biologics or topical treatments",
+        "bounds": {'texture_var': (1200, None), 'hue': (15, 25)}
+    },
+    # 17. Liver Disease (Advanced)
+    {
+        "name": "Advanced Liver Disease",
+        "confidence": "Medium",
+        "description": "Dark yellowish tone with dullness",
+        "penalty": 40,
+        "recommendation": "URGENT: See hepatologist for liver function tests",
+        "bounds": {'hue': (25, 35), 'sat': (90, None), 'val': (None, 120)}
+    },
+    # 18. Kidney Disease
+    {
+        "name": "Kidney Disease (Possible)",
+        "confidence": "Low",
+        "description": "Pale, puffy face with fluid retention",
+        "penalty": 25,
+        "recommendation": "Get kidney function tests (creatinine, BUN)",
+        "bounds": {'val': (180, None), 'sat': (None, 30), 'puffiness': FLAG}
+    },
+    # 19. Malnutrition
+    {
+        "name": "Malnutrition",
+        "confidence": "Medium",
+        "description": "Very pale and dull complexion",
+        "penalty": 30,
+        "recommendation": "Improve diet; consider nutritional supplements",
+        "bounds": {'sat': (None, 25), 'val': (None, 90), 'blur': (None, 50)}
+    },
+    # 20. Hormonal Imbalance (Acne pattern)
+    {
+        "name": "Hormonal Acne",
+        "confidence": "Medium",
+        "description": "Breakouts concentrated in lower face",
+        "penalty": 15,
+        "recommendation": "Consult endocrinologist; may need hormonal treatment",
+        "bounds": {'edge_density': (0.18, None), 'chin_h': (None, None)}
+    },
+    # 21. Stress / Anxiety
+    {
+        "name": "Chronic Stress / Anxiety",
+        "confidence": "Medium",
+        "description": "Emotional distress visible in facial features",
+        "penalty": 18,
+        "recommendation": "Practice stress management; consider counseling",
+        "bounds": {'stressed': FLAG, 'val': (None, 105)}
+    },
+    # 22. Vitamin D Deficiency
+    {
+        "name": "Vitamin D Deficiency",
+        "confidence": "Low",
+        "description": "Very pale skin lacking healthy glow",
+        "penalty": 12,
+        "recommendation": "Get sun exposure; vitamin D supplements",
+        "bounds": {'val': (165, None), 'sat': (None, 35)}
+    },
+    # 23. Perioral Dermatitis
+    {
+        "name": "Perioral Dermatitis",
+        "confidence": "Low",
+        "description": "Rash around mouth area",
+        "penalty": 10,
+        "recommendation": "Avoid steroid creams; see dermatologist",
+        "bounds": {'chin_h': (None, 20), 'edge_density': (0.14, None)}
+    },
+    # 24. Contact Dermatitis
+    {
+        "name": "Contact Dermatitis",
+        "confidence": "Low",
+        "description": "Localized redness from irritant/allergen",
+        "penalty": 10,
+        "recommendation": "Identify irritant; use hypoallergenic products",
+        "bounds": {'asymmetry': (25, None), 'hue': (None, 15)}
+    },
+    # 25. Sun Damage / Photoaging
+    {
+        "name": "Sun Damage / Photoaging",
+        "confidence": "Medium",
+        "description": "Uneven texture and pigmentation from UV exposure",
+        "penalty": 15,
+        "recommendation": "Daily SPF 50+; consider retinoids",
+        "bounds": {'texture_var': (900, None), 'hue': (15, 25)}
+    },
+]
+
+def _compile(rules):
+    """Pack the rule bounds into (n_rules, n_features, 2) arrays."""
+    bounds = np.empty((len(rules), len(FEATURES), 2))
+    bounds[:, :, 0] = -np.inf
+    bounds[:, :, 1] = np.inf
+    uses = np.zeros((len(rules), len(FEATURES)), dtype=bool)
+    for i, rule in enumerate(rules):
+        for name, (low, high) in rule["bounds"].items():
+            j = FEATURE_INDEX[name]
+            uses[i, j] = True
+            if low is not None:
+                bounds[i, j, 0] = low
+            if high is not None:
+                bounds[i, j, 1] = high
+    return bounds, uses
+
+RULE_BOUNDS, RULE_USES = _compile(RULES)
+RULE_PENALTIES = np.array([rule["penalty"] for rule in RULES])
+
+def feature_vector(values):
+    """Build the feature array from a name -> value dict; missing names become NaN."""
+    return np.array([values.get(name, np.nan) for name in FEATURES], dtype=np.float64)
+
+def rules_using(*names):
+    """Boolean mask of the rules that constrain any of the given features."""
+    return RULE_USES[:, [FEATURE_INDEX[name] for name in names]].any(axis=1)
+
+def match_rules(features, skip=()):
+    """
+    Evaluate every rule against the feature vector in one shot.
+    Features listed in skip are treated as satisfied.
+    """
+    skip_mask = np.zeros(len(FEATURES), dtype=bool)
+    skip_mask[[FEATURE_INDEX[name] for name in skip]] = True
+    inside = (features > RULE_BOUNDS[:, :, 0]) & (features < RULE_BOUNDS[:, :, 1])
+    return (inside | ~RULE_USES | skip_mask).all(axis=1)